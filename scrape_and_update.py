@@ -5,16 +5,34 @@ Scrapes the Manager and Recursive Reports table for Chuanqi Li from UniDash,
 updates the dashboard HTML, and uploads it to Google Drive.
 """
 
+import argparse
 import asyncio
+import atexit
+import base64
+import gzip
+import hashlib
 import json
 import os
+import random
 import re
+import string
 import subprocess
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
-from playwright.async_api import async_playwright
+from playwright.async_api import BrowserContext, Page, async_playwright
+
+try:
+    import orjson
+except ImportError:  # optional speedup; falls back to the stdlib encoder
+    orjson = None
 
 UNIDASH_URL = (
     "https://www.internalfb.com/unidash/dashboard/ai_usage_at_meta/"
@@ -29,138 +47,339 @@ UNIDASH_URL = (
 
 DASHBOARD_DIR = Path("/home/ubuntu/ai4p_dashboard")
 HTML_OUTPUT   = DASHBOARD_DIR / "index.html"
+GZIP_OUTPUT   = DASHBOARD_DIR / "index.html.gz"  # precompressed copy served by server.py
 GDRIVE_PATH   = "ai4p_dashboard/index.html"
 RCLONE_CONFIG = "/home/ubuntu/.gdrive-rclone.ini"
+RCLONE_REMOTE = "manus_google_drive"
+# Resident `rclone rcd` (see rclone-rcd.service); the CLI is used if it isn't running
+RCLONE_RC_URL = "http://127.0.0.1:5572"
+# Upper bound on one Drive copy (rc or CLI); a hung copy fails the upload instead of the refresh
+RCLONE_COPY_TIMEOUT = 600
+BROWSER_DATA_DIR = "/home/ubuntu/.browser_data_dir"
+# Auth snapshot from the last good scrape, restored if the profile loses its session.
+# Holds SSO cookies, so it lives next to the profile, outside the served DASHBOARD_DIR.
+STORAGE_STATE_FILE = Path(BROWSER_DATA_DIR).parent / ".ai4p_storage_state.json"
+
+# URL patterns (CDP Network.setBlockedURLs wildcards) not fetched during the scrape:
+# only the table's DOM text is needed
+BLOCKED_URL_PATTERNS = [
+    "*google-analytics*", "*segment.io*", "*doubleclick*", "*sourcemap*", "*.map",
+    "*.woff*", "*.ttf*", "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.mp4*",
+]
+
+# Chart.js is served from vendor/ next to index.html once vendored, else from the CDN
+CHART_JS_VERSION = "4.4.2"
+CHART_JS_URL  = f"https://cdn.jsdelivr.net/npm/chart.js@{CHART_JS_VERSION}/dist/chart.umd.min.js"
+CHART_JS_FILE = DASHBOARD_DIR / "vendor" / f"chart-{CHART_JS_VERSION}.umd.min.js"
+# Default SHA-256 of CHART_JS_URL's content for --vendor-chart-js, which refuses to
+# install anything else. Unset until pinned; the digest can also be passed on the
+# command line (hex, or the sha256-<base64> form jsDelivr publishes per file).
+CHART_JS_SHA256 = ""
+
+# Daemon refresh schedule (local hours, Pacific time)
+REFRESH_HOURS = (8, 12, 18)
+REFRESH_TZ    = ZoneInfo("America/Los_Angeles")
 
 # People to include in the dashboard (in display order)
 INCLUDE_NAMES = ["Chuanqi Li", "Bolun Yang", "Eleanor Pachaud", "Vivian Wang (Ads)"]
 
 LOG_FILE = DASHBOARD_DIR / "scrape.log"
 
+# Last scraped rows; reused instead of re-scraping while younger than CACHE_TTL.
+# Scheduled refreshes are further apart than this, so it mainly spares manual
+# re-runs and retries from launching the browser again.
+CACHE_FILE = DASHBOARD_DIR / "rows.cache.json"
+CACHE_TTL  = 3 * 3600  # seconds
+CACHE_VERSION = 2      # bump when the scraped row fields change
+
+# Usage colours indexed by usage_bucket(): under 70, 70-84, 85+
+PILL_CLASSES     = ("low", "yellow", "green")
+BAR_COLORS       = ("#b91c1c", "#92400e", "#166534")
+BAR_CHART_COLORS = ("#b91c1c", "#f5a623", "#36b37e")
+
+# SHA-256 of the data behind the last successful Drive upload
+UPLOAD_SHA_FILE = DASHBOARD_DIR / ".last_upload.sha256"
+
+# Scrape attempts per refresh before giving up (retries reuse the open page)
+SCRAPE_ATTEMPTS = 3
+
+# Consecutive failed refreshes before the daemon relaunches its browser
+DAEMON_MAX_FAILURES = 2
+
+# Rendered cells required before extracting: 7 columns x one row per person
+MIN_TABLE_CELLS = 7 * len(INCLUDE_NAMES)
+
+
+# Line-buffered log handle, opened on first use by _log_handle()
+_log_fh = None
+
+
+def _log_handle():
+    """Return the open log file, (re)opening it on first use or after logrotate moves it."""
+    global _log_fh
+    if _log_fh is not None:
+        try:
+            if os.stat(LOG_FILE).st_ino == os.fstat(_log_fh.fileno()).st_ino:
+                return _log_fh
+        except FileNotFoundError:
+            pass
+        _log_fh.close()
+    _log_fh = open(LOG_FILE, "a", buffering=1, encoding="utf-8")
+    return _log_fh
+
+
+@atexit.register
+def _close_log():
+    if _log_fh is not None:
+        _log_fh.close()
+
 
 def log(msg: str):
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     line = f"[{ts}] {msg}"
     print(line)
-    with open(LOG_FILE, "a") as f:
-        f.write(line + "\n")
+    _log_handle().write(line + "\n")
+
+
+async def block_nonessential(page: Page):
+    """
+    Stop the page fetching analytics, fonts, images and sourcemaps. Done through
+    CDP rather than page.route(), which would disable the HTTP cache and make
+    every reload re-download UniDash's bundles.
+    """
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+
+async def restore_auth(context: BrowserContext) -> bool:
+    """Load the cookies from the last save_auth() snapshot into the context."""
+    try:
+        state = json.loads(STORAGE_STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    cookies = state.get("cookies") or []
+    if cookies:
+        await context.add_cookies(cookies)
+    return bool(cookies)
+
 
+async def save_auth(context: BrowserContext):
+    """Snapshot the context's session cookies for restore_auth(). Best effort."""
+    try:
+        state = {"cookies": await context.cookies()}
+        # Create the file owner-only from the start; it holds session cookies
+        tmp = STORAGE_STATE_FILE.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, STORAGE_STATE_FILE)
+    except Exception as e:
+        log(f"Warning: could not save browser session: {e}")
 
-async def scrape_unidash() -> list[dict]:
-    """Navigate to UniDash with Chuanqi Li pre-selected and extract table rows."""
+
+@asynccontextmanager
+async def open_browser():
+    """Launch Chromium with the existing profile and yield its page."""
     log("Launching browser with existing profile...")
+    fresh_profile = not Path(BROWSER_DATA_DIR).exists()
     async with async_playwright() as p:
         browser = await p.chromium.launch_persistent_context(
-            user_data_dir="/home/ubuntu/.browser_data_dir",
+            user_data_dir=BROWSER_DATA_DIR,
             headless=True,
-            args=["--no-sandbox", "--disable-dev-shm-usage"],
+            args=[
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--disable-blink-features=AutomationControlled",
+                "--disable-background-networking",
+            ],
         )
-        page = browser.pages[0] if browser.pages else await browser.new_page()
-
+        if fresh_profile and await restore_auth(browser):
+            log(f"Profile missing; restored session cookies from {STORAGE_STATE_FILE}")
+        try:
+            page = browser.pages[0] if browser.pages else await browser.new_page()
+            await block_nonessential(page)
+            yield page
+        finally:
+            await browser.close()
+
+
+async def scrape_unidash(page: Page) -> list[dict]:
+    """Load UniDash with Chuanqi Li pre-selected on an open page and extract table rows."""
+    if page.url.split("?")[0] == UNIDASH_URL.split("?")[0]:
+        log("Reloading UniDash...")
+        await page.reload(wait_until="domcontentloaded", timeout=60000)
+    else:
         log(f"Navigating to UniDash (Chuanqi Li pre-selected)...")
-        await page.goto(UNIDASH_URL, wait_until="networkidle", timeout=60000)
+        await page.goto(UNIDASH_URL, wait_until="domcontentloaded", timeout=60000)
 
-        # Wait for the Manager and Recursive Reports table to appear
-        log("Waiting for Manager and Recursive Reports table...")
-        try:
-            await page.wait_for_selector("text=Manager and Recursive Reports", timeout=30000)
-            await page.wait_for_selector("text=Chuanqi Li", timeout=20000)
-            # Extra wait for table data to fully render
-            await asyncio.sleep(4)
-        except Exception as e:
-            log(f"Warning during wait: {e}")
+    # Redirected away from UniDash means the session expired; retry once with saved cookies
+    if not page.url.startswith(UNIDASH_URL.split("?")[0]) and await restore_auth(page.context):
+        log(f"Redirected to {page.url.split('?')[0]}; retrying with saved session cookies...")
+        await page.goto(UNIDASH_URL, wait_until="domcontentloaded", timeout=60000)
 
-        # Extract table rows
-        log("Extracting table data...")
-        rows = await page.evaluate("""
-            () => {
+    # Wait for the Manager and Recursive Reports table to appear
+    log("Waiting for Manager and Recursive Reports table...")
+    try:
+        await page.wait_for_selector("text=Manager and Recursive Reports", timeout=30000)
+        await page.wait_for_selector("text=Chuanqi Li", timeout=20000)
+        # Wait until every in-scope row has rendered its cells (7 cols x 4 people)
+        await page.wait_for_function(
+            f"document.querySelectorAll('table tbody tr td').length >= {MIN_TABLE_CELLS}",
+            timeout=30000,
+        )
+        # ...and until the row count has held steady for 3 polls 150 ms apart
+        # (gives up after 10 s and extracts whatever has rendered)
+        await page.evaluate("""
+            (minRows) => new Promise(resolve => {
+                const deadline = Date.now() + 10000;
+                let last = -1, stable = 0;
+                const check = () => {
+                    const n = document.querySelectorAll('table tbody tr').length;
+                    if (n === last && n >= minRows) {
+                        if (++stable >= 3) return resolve(n);
+                    } else {
+                        stable = 0;
+                        last = n;
+                    }
+                    if (Date.now() > deadline) return resolve(n);
+                    setTimeout(check, 150);
+                };
+                check();
+            })
+        """, len(INCLUDE_NAMES))
+    except Exception as e:
+        log(f"Warning during wait: {e}")
+
+    # Extract table rows
+    log("Extracting table data...")
+    rows = await page.evaluate("""
+        () => {
+            // Scope to the table under the "Manager and Recursive Reports" header;
+            // fall back to every table on the page if the header can't be found
+            // or the table it resolves to has no matching rows
+            const header = document.evaluate(
+                "//*[normalize-space(text())='Manager and Recursive Reports']",
+                document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null,
+            ).singleNodeValue;
+            let scope = header;
+            while (scope && !scope.querySelector('table')) scope = scope.parentElement;
+
+            const extract = (tables) => {
                 const results = [];
-                // Find all table rows in the Manager and Recursive Reports section
-                const tables = document.querySelectorAll('table');
                 for (const table of tables) {
-                    const rows = table.querySelectorAll('tbody tr');
-                    for (const row of rows) {
-                        const cells = row.querySelectorAll('td');
-                        if (cells.length >= 7) {
-                            const name = cells[0].innerText.trim().replace(/^[⤷↳\\s]+/, '').trim();
-                            const pillar = cells[1].innerText.trim();
-                            const func = cells[2].innerText.trim();
-                            const allocArea = cells[3].innerText.trim();
-                            const teamGroup = cells[4].innerText.trim();
-                            const l4_7 = cells[5].innerText.trim();
-                            const empCount = cells[6].innerText.trim();
-                            if (name && l4_7 && l4_7.includes('%')) {
-                                results.push({ name, pillar, func, allocArea, teamGroup, l4_7, empCount });
+                    for (const row of table.querySelectorAll('tbody tr')) {
+                        // textContent avoids the layout pass innerText forces on every cell
+                        const c = Array.from(row.querySelectorAll('td'), td => td.textContent.trim());
+                        if (c.length >= 7 && c[5].includes('%')) {
+                            const name = c[0].replace(/^[⤷↳\\s]+/, '').trim();
+                            if (name) {
+                                // Numeric values are parsed here once, next to their display strings
+                                results.push({ name, pillar: c[1], func: c[2], allocArea: c[3],
+                                               teamGroup: c[4], l4_7: c[5], empCount: c[6],
+                                               l4_7_pct: parseInt(c[5], 10) || 0,
+                                               empCount_int: parseInt(c[6].replace(/,/g, ''), 10) || 0 });
                             }
                         }
                     }
                 }
                 return results;
-            }
-        """)
+            };
+            const results = scope ? extract([scope.querySelector('table')]) : [];
+            return results.length ? results : extract(document.querySelectorAll('table'));
+        }
+    """)
+
+    log(f"Raw rows extracted: {len(rows)}")
+    return rows
 
-        await browser.close()
 
-        log(f"Raw rows extracted: {len(rows)}")
-        return rows
+def load_cached_rows() -> tuple[list[dict], float] | None:
+    """
+    Return (raw rows, scrape timestamp) from the cache if they are fresh and were
+    scraped from the same URL today.
+    """
+    try:
+        cache = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cache.get("version") != CACHE_VERSION:
+        return None
+    if cache.get("url") != UNIDASH_URL or cache.get("date") != datetime.now().strftime("%Y-%m-%d"):
+        return None
+    if time.time() - cache.get("ts", 0) >= CACHE_TTL:
+        return None
+    if not cache.get("rows"):
+        return None
+    return cache["rows"], cache["ts"]
+
+
+def save_cached_rows(rows: list[dict], scraped_at: float):
+    """Atomically write the raw rows and their scrape time to the cache file."""
+    cache = {
+        "version": CACHE_VERSION,
+        "ts": scraped_at,
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "url": UNIDASH_URL,
+        "rows": rows,
+    }
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache), encoding="utf-8")
+    os.replace(tmp, CACHE_FILE)
 
 
 def filter_rows(rows: list[dict]) -> list[dict]:
     """Keep only the rows for the 4 people in scope."""
+    # Index rows by lowercased name once; first occurrence wins, as in scrape order
+    by_name = {}
+    for row in rows:
+        by_name.setdefault(row["name"].lower(), row)
+
     filtered = []
     for name in INCLUDE_NAMES:
-        for row in rows:
-            # Normalize comparison
-            if name.lower() in row["name"].lower() or row["name"].lower() in name.lower():
-                row["name"] = name  # normalize display name
-                filtered.append(row)
-                break
+        name_low = name.lower()
+        row = by_name.get(name_low)
+        if row is None:
+            # Fall back to a substring match either way (e.g. "Vivian Wang" vs "Vivian Wang (Ads)")
+            key = next((k for k in by_name if name_low in k or k in name_low), None)
+            row = by_name.get(key)
+        if row is not None:
+            row["name"] = name  # normalize display name
+            filtered.append(row)
     return filtered
 
 
-def get_pill_class(pct_str: str) -> str:
+def usage_bucket(val: int) -> int:
+    """Threshold bucket: 0 = under 70 (red), 1 = 70-84 (yellow), 2 = 85+ (green)."""
+    return (val >= 85) + (val >= 70)
+
+
+def get_pill_class(val: int) -> str:
     """Return CSS class based on new thresholds: <70 red, 70-84 yellow, 85+ green."""
-    try:
-        val = int(pct_str.replace("%", "").strip())
-        if val >= 85:
-            return "green"
-        elif val >= 70:
-            return "yellow"
-        else:
-            return "low"
-    except:
-        return "low"
+    return PILL_CLASSES[usage_bucket(val)]
 
 
-def get_bar_color(pct_str: str) -> str:
-    try:
-        val = int(pct_str.replace("%", "").strip())
-        if val >= 85:
-            return "#166534"
-        elif val >= 70:
-            return "#92400e"
-        else:
-            return "#b91c1c"
-    except:
-        return "#b91c1c"
+def get_bar_color(val: int) -> str:
+    return BAR_COLORS[usage_bucket(val)]
 
 
-def get_bar_chart_color(pct_str: str) -> str:
-    try:
-        val = int(pct_str.replace("%", "").strip())
-        if val >= 85:
-            return "#36b37e"
-        elif val >= 70:
-            return "#f5a623"
-        else:
-            return "#b91c1c"
-    except:
-        return "#b91c1c"
+def get_bar_chart_color(val: int) -> str:
+    return BAR_CHART_COLORS[usage_bucket(val)]
+
+
+def enrich(rows: list[dict]) -> list[dict]:
+    """Attach the threshold-derived display fields to each row."""
+    for row in rows:
+        val = row["l4_7_pct"]
+        row["pill"]        = get_pill_class(val)
+        row["bar_color"]   = get_bar_color(val)
+        row["chart_color"] = get_bar_chart_color(val)
+    return rows
 
 
 def build_table_rows(rows: list[dict]) -> str:
-    html = ""
-    for i, row in enumerate(rows):
+    parts = []
+    for row in rows:
         is_manager = row["name"] == "Chuanqi Li"
         indent = ""
         if not is_manager:
@@ -171,23 +390,19 @@ def build_table_rows(rows: list[dict]) -> str:
                 indent = "padding-left:28px;"
 
         row_class = ' class="manager-row"' if is_manager else ""
-        pill = get_pill_class(row["l4_7"])
-        bar_color = get_bar_color(row["l4_7"])
-        pct_val = row["l4_7"].replace("%", "").strip()
-
-        html += f"""        <tr{row_class}>
+        parts.append(f"""        <tr{row_class}>
           <td style="{indent}"><span class="chain-arrow">↳</span>{row['name']}</td>
           <td>{row['pillar']}</td>
           <td>{row['func']}</td>
           <td>{row['allocArea']}</td>
           <td>{row['teamGroup']}</td>
           <td>
-            <span class="usage-pill {pill}">{row['l4_7']}</span>
-            <span class="progress-bar-bg"><span class="progress-bar-fill" style="width:{pct_val}%;background:{bar_color};"></span></span>
+            <span class="usage-pill {row['pill']}">{row['l4_7']}</span>
+            <span class="progress-bar-bg"><span class="progress-bar-fill" style="width:{row['l4_7_pct']}%;background:{row['bar_color']};"></span></span>
           </td>
           <td>{row['empCount']}</td>
-        </tr>\n"""
-    return html
+        </tr>\n""")
+    return "".join(parts)
 
 
 def build_kpi_cards(rows: list[dict]) -> dict:
@@ -199,11 +414,8 @@ def build_kpi_cards(rows: list[dict]) -> dict:
     org_count = org_row["empCount"] if org_row else "N/A"
 
     if pdm_rows:
-        def pct_val(r):
-            try: return int(r["l4_7"].replace("%","").strip())
-            except: return 0
-        highest = max(pdm_rows, key=pct_val)
-        lowest  = min(pdm_rows, key=pct_val)
+        highest = max(pdm_rows, key=lambda r: r["l4_7_pct"])
+        lowest  = min(pdm_rows, key=lambda r: r["l4_7_pct"])
     else:
         highest = lowest = None
 
@@ -219,48 +431,51 @@ def build_kpi_cards(rows: list[dict]) -> dict:
     }
 
 
+def _dumps(obj) -> str:
+    """Encode a chart payload as JSON for embedding in the page."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
 def build_chart_data(rows: list[dict]) -> tuple[str, str, str]:
     """Build JS arrays for the bar chart."""
-    labels = json.dumps([r["name"].replace(" (Ads)", "\n(Ads)") for r in rows])
-    data   = json.dumps([int(r["l4_7"].replace("%","").strip()) for r in rows])
-    colors = json.dumps([get_bar_chart_color(r["l4_7"]) for r in rows])
+    labels = _dumps([r["name"].replace(" (Ads)", "\n(Ads)") for r in rows])
+    data   = _dumps([r["l4_7_pct"] for r in rows])
+    colors = _dumps([r["chart_color"] for r in rows])
     return labels, data, colors
 
 
 def build_doughnut_data(rows: list[dict]) -> tuple[str, str]:
     pdm_rows = [r for r in rows if r["name"] != "Chuanqi Li"]
-    labels = json.dumps([f"{r['name']} ({r['empCount']})" for r in pdm_rows])
-    data   = json.dumps([int(r["empCount"]) if r["empCount"].isdigit() else 0 for r in pdm_rows])
+    labels = _dumps([f"{r['name']} ({r['empCount']})" for r in pdm_rows])
+    data   = _dumps([r["empCount_int"] for r in pdm_rows])
     return labels, data
 
 
-def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
-    kpi = build_kpi_cards(rows)
-    table_rows = build_table_rows(rows)
-    bar_labels, bar_data, bar_colors = build_chart_data(rows)
-    doughnut_labels, doughnut_data = build_doughnut_data(rows)
-
-    return f"""<!DOCTYPE html>
+# Static page shell; only the $-placeholders are filled in per refresh
+# (JS template literals are escaped as $${...})
+HTML_TEMPLATE = string.Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0" />
   <title>AI4P Tool Usage Dashboard – Chuanqi Li's Org</title>
-  <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.2/dist/chart.umd.min.js"></script>
+  <script src="$chart_js_src"></script>
   <style>
-    *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-    body {{
+    *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
+    body {
       font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
       background: #f0f2f5;
       color: #1c1e21;
       min-height: 100vh;
-    }}
-    header {{
+    }
+    header {
       background: linear-gradient(135deg, #0866ff 0%, #0052cc 100%);
       color: #fff;
       padding: 28px 40px 24px;
-    }}
-    header .badge {{
+    }
+    header .badge {
       display: inline-block;
       background: rgba(255,255,255,0.2);
       border-radius: 20px;
@@ -270,13 +485,13 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
       letter-spacing: 0.8px;
       text-transform: uppercase;
       margin-bottom: 10px;
-    }}
-    header h1 {{ font-size: 26px; font-weight: 700; line-height: 1.3; }}
-    header p {{ margin-top: 6px; font-size: 13px; opacity: 0.85; }}
-    .header-meta {{ display: flex; gap: 24px; margin-top: 14px; flex-wrap: wrap; }}
-    .header-meta span {{ font-size: 12px; opacity: 0.8; }}
-    .header-meta strong {{ opacity: 1; font-weight: 600; }}
-    .data-source {{
+    }
+    header h1 { font-size: 26px; font-weight: 700; line-height: 1.3; }
+    header p { margin-top: 6px; font-size: 13px; opacity: 0.85; }
+    .header-meta { display: flex; gap: 24px; margin-top: 14px; flex-wrap: wrap; }
+    .header-meta span { font-size: 12px; opacity: 0.8; }
+    .header-meta strong { opacity: 1; font-weight: 600; }
+    .data-source {
       display: inline-flex;
       align-items: center;
       gap: 6px;
@@ -285,72 +500,72 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
       padding: 5px 12px;
       font-size: 11px;
       margin-top: 12px;
-    }}
-    .data-source a {{ color: #fff; text-decoration: underline; opacity: 0.9; }}
-    main {{ max-width: 1200px; margin: 0 auto; padding: 32px 24px 48px; }}
-    .section-title {{
+    }
+    .data-source a { color: #fff; text-decoration: underline; opacity: 0.9; }
+    main { max-width: 1200px; margin: 0 auto; padding: 32px 24px 48px; }
+    .section-title {
       font-size: 13px;
       font-weight: 700;
       text-transform: uppercase;
       letter-spacing: 0.7px;
       color: #65676b;
       margin-bottom: 14px;
-    }}
-    .kpi-grid {{
+    }
+    .kpi-grid {
       display: grid;
       grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
       gap: 16px;
       margin-bottom: 32px;
-    }}
-    .kpi-card {{
+    }
+    .kpi-card {
       background: #fff;
       border-radius: 12px;
       padding: 20px 22px;
       box-shadow: 0 1px 4px rgba(0,0,0,0.08);
       border-top: 4px solid #0866ff;
       transition: box-shadow 0.2s;
-    }}
-    .kpi-card:hover {{ box-shadow: 0 4px 16px rgba(0,0,0,0.12); }}
-    .kpi-card.warn  {{ border-top-color: #f5a623; }}
-    .kpi-card.good  {{ border-top-color: #36b37e; }}
-    .kpi-label {{
+    }
+    .kpi-card:hover { box-shadow: 0 4px 16px rgba(0,0,0,0.12); }
+    .kpi-card.warn  { border-top-color: #f5a623; }
+    .kpi-card.good  { border-top-color: #36b37e; }
+    .kpi-label {
       font-size: 11px;
       font-weight: 600;
       text-transform: uppercase;
       letter-spacing: 0.6px;
       color: #65676b;
       margin-bottom: 8px;
-    }}
-    .kpi-value {{ font-size: 34px; font-weight: 700; color: #1c1e21; line-height: 1; }}
-    .kpi-sub {{ font-size: 12px; color: #65676b; margin-top: 6px; }}
-    .charts-row {{
+    }
+    .kpi-value { font-size: 34px; font-weight: 700; color: #1c1e21; line-height: 1; }
+    .kpi-sub { font-size: 12px; color: #65676b; margin-top: 6px; }
+    .charts-row {
       display: grid;
       grid-template-columns: 1fr 1fr;
       gap: 20px;
       margin-bottom: 32px;
-    }}
-    @media (max-width: 720px) {{ .charts-row {{ grid-template-columns: 1fr; }} }}
-    .chart-card {{
+    }
+    @media (max-width: 720px) { .charts-row { grid-template-columns: 1fr; } }
+    .chart-card {
       background: #fff;
       border-radius: 12px;
       padding: 22px 24px;
       box-shadow: 0 1px 4px rgba(0,0,0,0.08);
-    }}
-    .chart-card h3 {{ font-size: 14px; font-weight: 600; color: #1c1e21; margin-bottom: 16px; }}
-    .chart-wrap {{ position: relative; height: 240px; }}
-    .table-card {{
+    }
+    .chart-card h3 { font-size: 14px; font-weight: 600; color: #1c1e21; margin-bottom: 16px; }
+    .chart-wrap { position: relative; height: 240px; }
+    .table-card {
       background: #fff;
       border-radius: 12px;
       padding: 22px 24px;
       box-shadow: 0 1px 4px rgba(0,0,0,0.08);
       margin-bottom: 32px;
       overflow-x: auto;
-    }}
-    .table-card h3 {{ font-size: 14px; font-weight: 600; color: #1c1e21; margin-bottom: 4px; }}
-    .table-note {{ font-size: 11px; color: #65676b; font-style: italic; margin-bottom: 16px; }}
-    table {{ width: 100%; border-collapse: collapse; font-size: 13px; }}
-    thead tr {{ background: #f0f2f5; }}
-    thead th {{
+    }
+    .table-card h3 { font-size: 14px; font-weight: 600; color: #1c1e21; margin-bottom: 4px; }
+    .table-note { font-size: 11px; color: #65676b; font-style: italic; margin-bottom: 16px; }
+    table { width: 100%; border-collapse: collapse; font-size: 13px; }
+    thead tr { background: #f0f2f5; }
+    thead th {
       text-align: left;
       padding: 10px 14px;
       font-size: 11px;
@@ -360,15 +575,15 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
       color: #65676b;
       border-bottom: 2px solid #e4e6eb;
       white-space: nowrap;
-    }}
-    tbody tr {{ border-bottom: 1px solid #e4e6eb; transition: background 0.15s; }}
-    tbody tr:last-child {{ border-bottom: none; }}
-    tbody tr:hover {{ background: #f7f8fa; }}
-    tbody td {{ padding: 12px 14px; vertical-align: middle; }}
-    tbody tr.manager-row td {{ font-weight: 700; background: #eef3ff; }}
-    tbody tr.manager-row:hover {{ background: #e4ecff; }}
-    .chain-arrow {{ color: #65676b; margin-right: 4px; font-size: 12px; }}
-    .usage-pill {{
+    }
+    tbody tr { border-bottom: 1px solid #e4e6eb; transition: background 0.15s; }
+    tbody tr:last-child { border-bottom: none; }
+    tbody tr:hover { background: #f7f8fa; }
+    tbody td { padding: 12px 14px; vertical-align: middle; }
+    tbody tr.manager-row td { font-weight: 700; background: #eef3ff; }
+    tbody tr.manager-row:hover { background: #e4ecff; }
+    .chain-arrow { color: #65676b; margin-right: 4px; font-size: 12px; }
+    .usage-pill {
       display: inline-flex;
       align-items: center;
       gap: 6px;
@@ -376,11 +591,11 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
       padding: 4px 10px;
       font-size: 12px;
       font-weight: 700;
-    }}
-    .usage-pill.low    {{ background: #fde8e8; color: #b91c1c; }}
-    .usage-pill.yellow {{ background: #fef9c3; color: #92400e; }}
-    .usage-pill.green  {{ background: #dcfce7; color: #166534; }}
-    .progress-bar-bg {{
+    }
+    .usage-pill.low    { background: #fde8e8; color: #b91c1c; }
+    .usage-pill.yellow { background: #fef9c3; color: #92400e; }
+    .usage-pill.green  { background: #dcfce7; color: #166534; }
+    .progress-bar-bg {
       background: #e4e6eb;
       border-radius: 4px;
       height: 6px;
@@ -388,9 +603,9 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
       display: inline-block;
       vertical-align: middle;
       margin-left: 8px;
-    }}
-    .progress-bar-fill {{ height: 100%; border-radius: 4px; }}
-    .scope-note {{
+    }
+    .progress-bar-fill { height: 100%; border-radius: 4px; }
+    .scope-note {
       background: #fff;
       border-radius: 12px;
       padding: 16px 22px;
@@ -399,18 +614,18 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
       font-size: 12px;
       color: #444;
       border-left: 4px solid #0866ff;
-    }}
-    .scope-note strong {{ color: #1c1e21; }}
-    footer {{ text-align: center; font-size: 11px; color: #65676b; padding-bottom: 24px; }}
-    footer a {{ color: #0866ff; text-decoration: none; }}
-    .refresh-badge {{
+    }
+    .scope-note strong { color: #1c1e21; }
+    footer { text-align: center; font-size: 11px; color: #65676b; padding-bottom: 24px; }
+    footer a { color: #0866ff; text-decoration: none; }
+    .refresh-badge {
       display: inline-block;
       background: rgba(255,255,255,0.25);
       border-radius: 6px;
       padding: 4px 10px;
       font-size: 11px;
       margin-top: 8px;
-    }}
+    }
   </style>
 </head>
 <body>
@@ -420,12 +635,12 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
   <h1>AI4P Tool Usage Dashboard</h1>
   <p>Manager &amp; Recursive Reports — Chuanqi Li's Org</p>
   <div class="header-meta">
-    <span><strong>Data as of:</strong> {data_as_of}</span>
+    <span><strong>Data as of:</strong> $data_as_of</span>
   </div>
   <div class="data-source">
     &#128279; Data sourced live from
     <a href="https://www.internalfb.com/unidash/dashboard/ai_usage_at_meta/ai4p_by_pillar/overall_one_pager" target="_blank">UniDash · AI4P by Pillar</a>
-    &nbsp;· Last refreshed: {retrieved_at}
+    &nbsp;· Last refreshed: $retrieved_at
   </div>
   <div class="refresh-badge">&#128260; Auto-refreshes 3× daily (8 AM, 12 PM, 6 PM PT)</div>
 </header>
@@ -441,18 +656,18 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
   <div class="kpi-grid">
     <div class="kpi-card">
       <div class="kpi-label">Org AI Usage (L4+/7)</div>
-      <div class="kpi-value">{kpi['org_pct']}</div>
-      <div class="kpi-sub">Chuanqi Li's full org · {kpi['org_count']} employees</div>
+      <div class="kpi-value">$org_pct</div>
+      <div class="kpi-sub">Chuanqi Li's full org · $org_count employees</div>
     </div>
     <div class="kpi-card good">
       <div class="kpi-label">Highest Usage (PDM)</div>
-      <div class="kpi-value">{kpi['highest_pct']}</div>
-      <div class="kpi-sub">{kpi['highest_name']} · {kpi['highest_count']} employees</div>
+      <div class="kpi-value">$highest_pct</div>
+      <div class="kpi-sub">$highest_name · $highest_count employees</div>
     </div>
     <div class="kpi-card warn">
       <div class="kpi-label">Lowest Usage (PDM)</div>
-      <div class="kpi-value">{kpi['lowest_pct']}</div>
-      <div class="kpi-sub">{kpi['lowest_name']} · {kpi['lowest_count']} employees</div>
+      <div class="kpi-value">$lowest_pct</div>
+      <div class="kpi-sub">$lowest_name · $lowest_count employees</div>
     </div>
   </div>
 
@@ -477,7 +692,7 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
     <h3>Detailed View — Manager: Chuanqi Li</h3>
     <p class="table-note">
       Note: This table is impacted by the global filters above, except date (which is limited to the latest ds).
-      Data sourced directly from UniDash AI4P by Pillar dashboard, Manager Name = "Chuanqi Li". As of {data_as_of}.
+      Data sourced directly from UniDash AI4P by Pillar dashboard, Manager Name = "Chuanqi Li". As of $data_as_of.
     </p>
     <table>
       <thead>
@@ -492,7 +707,7 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
         </tr>
       </thead>
       <tbody>
-{table_rows}      </tbody>
+$table_rows      </tbody>
     </table>
   </div>
 
@@ -512,121 +727,262 @@ def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
 
 <footer>
   Data sourced live from <a href="https://www.internalfb.com/unidash/dashboard/ai_usage_at_meta/ai4p_by_pillar/overall_one_pager" target="_blank">UniDash · AI4P by Pillar</a>
-  &nbsp;|&nbsp; Manager: Chuanqi Li &nbsp;|&nbsp; Function: PD &nbsp;|&nbsp; Data as of {data_as_of} &nbsp;|&nbsp; Last refreshed: {retrieved_at}
+  &nbsp;|&nbsp; Manager: Chuanqi Li &nbsp;|&nbsp; Function: PD &nbsp;|&nbsp; Data as of $data_as_of &nbsp;|&nbsp; Last refreshed: $retrieved_at
 </footer>
 
 <script>
   const barCtx = document.getElementById('barChart').getContext('2d');
-  new Chart(barCtx, {{
+  new Chart(barCtx, {
     type: 'bar',
-    data: {{
-      labels: {bar_labels},
-      datasets: [{{
+    data: {
+      labels: $bar_labels,
+      datasets: [{
         label: 'L4+/7 Usage Rate (%)',
-        data: {bar_data},
-        backgroundColor: {bar_colors},
+        data: $bar_data,
+        backgroundColor: $bar_colors,
         borderRadius: 6,
         borderSkipped: false,
-      }}]
-    }},
-    options: {{
+      }]
+    },
+    options: {
       responsive: true,
       maintainAspectRatio: false,
-      plugins: {{
-        legend: {{ display: false }},
-        tooltip: {{
-          callbacks: {{
-            label: ctx => ` ${{ctx.parsed.y}}% AI usage rate (L4+/7)`
-          }}
-        }}
-      }},
-      scales: {{
-        y: {{
+      plugins: {
+        legend: { display: false },
+        tooltip: {
+          callbacks: {
+            label: ctx => ` $${ctx.parsed.y}% AI usage rate (L4+/7)`
+          }
+        }
+      },
+      scales: {
+        y: {
           beginAtZero: true,
           max: 100,
-          ticks: {{ callback: v => v + '%', font: {{ size: 11 }} }},
-          grid: {{ color: '#e4e6eb' }}
-        }},
-        x: {{
-          ticks: {{ font: {{ size: 11 }} }},
-          grid: {{ display: false }}
-        }}
-      }}
-    }}
-  }});
+          ticks: { callback: v => v + '%', font: { size: 11 } },
+          grid: { color: '#e4e6eb' }
+        },
+        x: {
+          ticks: { font: { size: 11 } },
+          grid: { display: false }
+        }
+      }
+    }
+  });
 
   const dCtx = document.getElementById('doughnutChart').getContext('2d');
-  new Chart(dCtx, {{
+  new Chart(dCtx, {
     type: 'doughnut',
-    data: {{
-      labels: {doughnut_labels},
-      datasets: [{{
-        data: {doughnut_data},
+    data: {
+      labels: $doughnut_labels,
+      datasets: [{
+        data: $doughnut_data,
         backgroundColor: ['#f5a623', '#6554c0', '#36b37e'],
         borderWidth: 2,
         borderColor: '#fff',
         hoverOffset: 6
-      }}]
-    }},
-    options: {{
+      }]
+    },
+    options: {
       responsive: true,
       maintainAspectRatio: false,
       cutout: '62%',
-      plugins: {{
-        legend: {{
+      plugins: {
+        legend: {
           position: 'bottom',
-          labels: {{ font: {{ size: 11 }}, padding: 12, boxWidth: 12 }}
-        }},
-        tooltip: {{
-          callbacks: {{
-            label: ctx => ` ${{ctx.label}}: ${{ctx.parsed}} employees`
-          }}
-        }}
-      }}
-    }}
-  }});
+          labels: { font: { size: 11 }, padding: 12, boxWidth: 12 }
+        },
+        tooltip: {
+          callbacks: {
+            label: ctx => ` $${ctx.label}: $${ctx.parsed} employees`
+          }
+        }
+      }
+    }
+  });
 </script>
 </body>
-</html>"""
+</html>""")
+# Changes whenever the template text does, so template edits force a re-upload
+TEMPLATE_VERSION = hashlib.sha256(HTML_TEMPLATE.template.encode("utf-8")).hexdigest()
 
 
-def upload_to_gdrive():
-    """Upload the dashboard HTML to Google Drive."""
-    log("Uploading to Google Drive...")
+def generate_html(rows: list[dict], retrieved_at: str, data_as_of: str) -> str:
+    """Render the dashboard page from filtered rows that have been through enrich()."""
+    bar_labels, bar_data, bar_colors = build_chart_data(rows)
+    doughnut_labels, doughnut_data = build_doughnut_data(rows)
+
+    return HTML_TEMPLATE.substitute(
+        build_kpi_cards(rows),
+        table_rows=build_table_rows(rows),
+        bar_labels=bar_labels,
+        bar_data=bar_data,
+        bar_colors=bar_colors,
+        doughnut_labels=doughnut_labels,
+        doughnut_data=doughnut_data,
+        retrieved_at=retrieved_at,
+        data_as_of=data_as_of,
+        chart_js_src=chart_js_src(),
+    )
+
+
+def chart_js_src() -> str:
+    """Chart.js URL for the page: the vendored copy once installed, else the CDN."""
+    if CHART_JS_FILE.exists():
+        return f"{CHART_JS_FILE.parent.name}/{CHART_JS_FILE.name}"
+    return CHART_JS_URL
+
+
+def vendor_chart_js(expected_sha256: str = CHART_JS_SHA256) -> bool:
+    """
+    One-time setup: download the pinned Chart.js build into vendor/ after
+    checking it against `expected_sha256` (hex or "sha256-<base64>"). Not part
+    of a refresh; until it has run, the page loads Chart.js from the CDN.
+    """
+    if expected_sha256.startswith("sha256-"):
+        expected_sha256 = base64.b64decode(expected_sha256[len("sha256-"):]).hex()
+    if CHART_JS_FILE.exists():
+        log(f"Chart.js already vendored at {CHART_JS_FILE}")
+        return True
+    try:
+        with urllib.request.urlopen(CHART_JS_URL, timeout=30) as resp:
+            data = resp.read()
+    except OSError as e:
+        log(f"ERROR: could not download Chart.js: {e}")
+        return False
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != expected_sha256.lower():
+        # server.py serves vendor/ as immutable for a year, so never keep unverified bytes
+        log(f"ERROR: Chart.js SHA-256 {digest} does not match the pinned "
+            f"{expected_sha256 or '(unset)'}; not vendoring.")
+        return False
+    CHART_JS_FILE.parent.mkdir(exist_ok=True)
+    tmp = CHART_JS_FILE.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, CHART_JS_FILE)
+    log(f"Vendored Chart.js {CHART_JS_VERSION} to {CHART_JS_FILE}")
+    return True
+
+
+def rc_call(method: str, params: dict, timeout: float = RCLONE_COPY_TIMEOUT) -> dict:
+    """
+    POST a command to the resident rclone rc server and return its JSON reply.
+    The default timeout leaves room for a Drive copy, which can take minutes.
+    """
+    req = urllib.request.Request(
+        f"{RCLONE_RC_URL}/{method}", data=json.dumps(params).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        try:
+            result = json.loads(e.read() or b"{}")
+        except ValueError:  # e.g. an HTML error page from a proxy
+            result = {}
+        result.setdefault("error", str(e))
+        return result
+
+
+def upload_via_rcd() -> bool:
+    """Copy the dashboard HTML through the resident rclone rc server."""
+    dst_dir, dst_name = GDRIVE_PATH.rsplit("/", 1)
+    result = rc_call("operations/copyfile", {
+        "srcFs": str(HTML_OUTPUT.parent),
+        "srcRemote": HTML_OUTPUT.name,
+        "dstFs": f"{RCLONE_REMOTE}:{dst_dir}",
+        "dstRemote": dst_name,
+    })
+    if result.get("error"):
+        log(f"Upload error: {result['error']}")
+        return False
+    return True
+
+
+def warm_rclone():
+    """
+    Without a resident rc server, get the rclone binary, config and OAuth token
+    warm before the upload by running `rclone about`. Skipped when rcd answers,
+    since it already holds them. Best effort; the upload reports its own errors.
+    """
+    try:
+        try:
+            rc_call("rc/noop", {}, timeout=2)
+            return
+        except urllib.error.URLError:
+            pass
+        subprocess.run(
+            ["rclone", "--config", RCLONE_CONFIG, "about", f"{RCLONE_REMOTE}:"],
+            capture_output=True, timeout=60,
+        )
+    except Exception as e:
+        log(f"rclone warmup failed: {e}")
+
+
+def upload_via_cli() -> bool:
+    """Copy the dashboard HTML with a one-off rclone process."""
     result = subprocess.run(
         ["rclone", "copyto", str(HTML_OUTPUT),
-         f"manus_google_drive:{GDRIVE_PATH}",
+         f"{RCLONE_REMOTE}:{GDRIVE_PATH}",
          "--config", RCLONE_CONFIG],
-        capture_output=True, text=True
+        capture_output=True, text=True, timeout=RCLONE_COPY_TIMEOUT,
     )
     if result.returncode != 0:
         log(f"Upload error: {result.stderr}")
         return False
+    return True
+
+
+def upload_to_gdrive():
+    """Upload the dashboard HTML to Google Drive."""
+    log("Uploading to Google Drive...")
+    try:
+        try:
+            success = upload_via_rcd()
+        except urllib.error.URLError as e:
+            log(f"rclone rcd unavailable ({e.reason}); falling back to rclone CLI.")
+            success = upload_via_cli()
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        # Read timeouts, connection resets, malformed replies, missing rclone binary
+        log(f"Upload error: {e}")
+        return False
+    if not success:
+        return False
     log("Upload to Google Drive successful.")
     return True
 
 
-async def main():
-    log("=" * 60)
-    log("Starting AI4P dashboard refresh...")
+def content_digest(rows: list[dict], data_as_of: str) -> str:
+    """
+    Hash everything that should trigger an upload: the data rows (the KPIs and
+    charts derive from these), the "Data as of" date and the page template. The
+    refresh timestamps are deliberately left out so they don't force an upload
+    on their own.
+    """
+    payload = {
+        "rows": rows,
+        "data_as_of": data_as_of,
+        "template": TEMPLATE_VERSION,
+        "chart_js": chart_js_src(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
 
-    # Scrape data
-    try:
-        raw_rows = await scrape_unidash()
-    except Exception as e:
-        log(f"ERROR during scrape: {e}")
-        sys.exit(1)
 
-    # Filter to the 4 people in scope
-    rows = filter_rows(raw_rows)
+def publish(raw_rows: list[dict], scraped_at: float) -> bool:
+    """Filter the raw rows, write the dashboard HTML and upload it. False if nothing matched."""
+    # Filter to the 4 people in scope; enrich copies so raw_rows stay cacheable
+    rows = [dict(row) for row in filter_rows(raw_rows)]
     log(f"Filtered rows: {[r['name'] for r in rows]}")
 
     if not rows:
         log("ERROR: No matching rows found. Keeping existing dashboard.")
-        sys.exit(1)
+        return False
+    enrich(rows)
 
     # Determine data_as_of from the page or use today
-    retrieved_at = datetime.now().strftime("%b %d, %Y at %I:%M %p PT")
+    # "Last refreshed" is when the rows were scraped, which differs from now on a cache hit
+    retrieved_at = datetime.fromtimestamp(scraped_at).strftime("%b %d, %Y at %I:%M %p PT")
     # Try to extract the "As of" date from the scraped page context
     data_as_of = datetime.now().strftime("%Y-%m-%d") + " (latest ds)"
 
@@ -635,16 +991,159 @@ async def main():
 
     # Write to file
     HTML_OUTPUT.write_text(html, encoding="utf-8")
+    GZIP_OUTPUT.write_bytes(gzip.compress(html.encode("utf-8"), compresslevel=9, mtime=0))
     log(f"Dashboard HTML written to {HTML_OUTPUT}")
 
-    # Upload to Google Drive
-    success = upload_to_gdrive()
-    if not success:
+    # Upload to Google Drive, unless the data is unchanged since the last upload
+    digest = content_digest(rows, data_as_of)
+    try:
+        last_digest = UPLOAD_SHA_FILE.read_text().strip()
+    except OSError:
+        last_digest = None
+    if digest == last_digest:
+        log("Dashboard data unchanged; skipping upload.")
+    elif upload_to_gdrive():
+        UPLOAD_SHA_FILE.write_text(digest + "\n")
+    else:
         log("WARNING: Google Drive upload failed.")
+    return True
+
+
+async def scrape_with_retry(page: Page, attempts: int = SCRAPE_ATTEMPTS) -> list[dict]:
+    """
+    Scrape on the same page up to `attempts` times, backing off with jitter in
+    between. An empty table counts as a failure. Each retry reloads the page
+    (see scrape_unidash) rather than relaunching the browser.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            rows = await scrape_unidash(page)
+            if rows:
+                await save_auth(page.context)
+                return rows
+            error = "no table rows extracted"
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            error = e
+        if attempt == attempts:
+            return []
+        delay = 2 ** attempt + random.uniform(0, 1)
+        log(f"Scrape attempt {attempt}/{attempts} failed ({error}); retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+
+
+async def fetch_rows(page: Page | None) -> list[dict]:
+    """Scrape with the given page, or with a browser launched just for this call."""
+    if page is None:
+        async with open_browser() as page:
+            return await scrape_with_retry(page)
+    return await scrape_with_retry(page)
+
+
+async def refresh_once(page: Page | None, force: bool = False) -> bool:
+    """
+    Run one dashboard refresh. `page` is an already-open browser page to scrape
+    with; if None, a browser is launched for this refresh only (and only when
+    the row cache is stale). Returns False if the dashboard was not updated.
+    """
+    log("=" * 60)
+    log("Starting AI4P dashboard refresh...")
+
+    # Reuse recently scraped rows unless a rescrape is forced
+    cached = None if force else load_cached_rows()
+    if cached is not None:
+        raw_rows, scraped_at = cached
+        log(f"Using cached rows from {CACHE_FILE} ({len(raw_rows)} rows, "
+            f"scraped {datetime.fromtimestamp(scraped_at):%H:%M}).")
+    else:
+        try:
+            # Warm up rclone while the (much slower) scrape runs; never waited on,
+            # and a daemon thread so a slow warmup can't delay process exit
+            threading.Thread(target=warm_rclone, daemon=True).start()
+            raw_rows = await fetch_rows(page)
+        except Exception as e:
+            log(f"ERROR during scrape: {e}")
+            return False
+        scraped_at = time.time()
+
+    # Off the event loop: the upload can block for up to RCLONE_COPY_TIMEOUT
+    if not await asyncio.to_thread(publish, raw_rows, scraped_at):
+        return False
+    # Cache only complete scrapes that published, so a partial or wrong-table
+    # scrape is retried next time instead of being served for CACHE_TTL
+    if cached is None:
+        if len(filter_rows(raw_rows)) == len(INCLUDE_NAMES):
+            save_cached_rows(raw_rows, scraped_at)
+        else:
+            log("WARNING: Scrape is missing people in scope; not caching rows.")
 
     log("Dashboard refresh complete.")
     log("=" * 60)
+    return True
+
+
+def next_cron_delta(now: datetime | None = None) -> float:
+    """Seconds until the next scheduled refresh (REFRESH_HOURS, Pacific time)."""
+    now = now or datetime.now(REFRESH_TZ)
+    for day in range(2):
+        for hour in REFRESH_HOURS:
+            run = (now + timedelta(days=day)).replace(hour=hour, minute=0, second=0, microsecond=0)
+            if run > now:
+                # Compare timestamps so DST transitions are accounted for
+                return run.timestamp() - now.timestamp()
+    raise AssertionError("no refresh scheduled within two days")
+
+
+async def run_daemon(force: bool = False):
+    """
+    Keep one browser open and refresh on the REFRESH_HOURS schedule. The browser
+    is relaunched, and the refresh retried straight away, when its page has
+    crashed or closed, or DAEMON_MAX_FAILURES refreshes in a row have failed. A failure to
+    launch the browser ends the daemon so systemd can restart it.
+    """
+    log("Starting AI4P dashboard daemon...")
+    due_now = True  # at startup and after a relaunch
+    while True:
+        failures = 0
+        async with open_browser() as page:
+            # A crashed renderer leaves is_closed() False, so watch for it explicitly
+            crashed = asyncio.Event()
+            page.on("crash", lambda _: crashed.set())
+            while True:
+                if not due_now:
+                    delay = next_cron_delta()
+                    log(f"Next refresh in {delay / 60:.0f} min.")
+                    await asyncio.sleep(delay)
+                due_now = False
+                try:
+                    ok = await refresh_once(page, force=force)
+                except Exception as e:
+                    log(f"ERROR during refresh: {e}")
+                    ok = False
+                force = False
+                failures = 0 if ok else failures + 1
+                if crashed.is_set() or page.is_closed() or failures >= DAEMON_MAX_FAILURES:
+                    log("Browser page unusable; relaunching browser...")
+                    due_now = True
+                    break
+
+
+async def main(force: bool = False):
+    if not await refresh_once(None, force=force):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the cached rows and rescrape UniDash")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay resident and refresh at 8 AM, 12 PM and 6 PM PT")
+    parser.add_argument("--vendor-chart-js", nargs="?", const=CHART_JS_SHA256, metavar="SHA256",
+                        help="one-time setup: download Chart.js into vendor/ if it matches "
+                             "SHA256 (default: the pinned CHART_JS_SHA256), then exit")
+    args = parser.parse_args()
+    if args.vendor_chart_js is not None:
+        sys.exit(0 if vendor_chart_js(args.vendor_chart_js) else 1)
+    asyncio.run(run_daemon(force=args.force) if args.daemon else main(force=args.force))
@@ -1,18 +1,55 @@
 #!/usr/bin/env python3
 """Simple Flask server to serve the AI4P dashboard on port 8080."""
-from flask import Flask, send_from_directory
+from flask import Flask, abort, request, send_from_directory
 from pathlib import Path
 
 app = Flask(__name__)
 DASHBOARD_DIR = Path(__file__).parent
+# Only front-end assets are served from DASHBOARD_DIR; logs, caches and data stay private.
+# index.html (and its .gz copy) are only reachable through index().
+STATIC_SUFFIXES = {".js", ".css", ".png", ".jpg", ".svg", ".ico", ".woff2"}
 
 @app.route("/")
+@app.route("/index.html")
 def index():
-    return send_from_directory(DASHBOARD_DIR, "index.html")
+    # Prefer the gzipped copy written by scrape_and_update.py, unless index.html is newer
+    html, gz = DASHBOARD_DIR / "index.html", DASHBOARD_DIR / "index.html.gz"
+    if not html.exists():
+        abort(404)
+    if (request.accept_encodings["gzip"] > 0  # honours q-values, e.g. "gzip;q=0"
+            and gz.exists() and gz.stat().st_mtime >= html.stat().st_mtime):
+        # Byte ranges of the compressed stream are meaningless to clients, so ignore Range
+        request.environ.pop("HTTP_RANGE", None)
+        resp = send_from_directory(DASHBOARD_DIR, gz.name, mimetype="text/html",
+                                   conditional=True, max_age=180)
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.headers["Accept-Ranges"] = "none"
+    else:
+        resp = send_from_directory(DASHBOARD_DIR, html.name, conditional=True, max_age=180)
+    resp.headers["Vary"] = "Accept-Encoding"
+    # Data only changes 3x/day; ETag/Last-Modified let repeat visits get a 304
+    resp.headers["Cache-Control"] = "public, max-age=180"
+    return resp
+
+@app.route("/vendor/<path:filename>")
+def vendor_files(filename):
+    # Vendored assets carry their version in the filename, so they never change
+    resp = send_from_directory(DASHBOARD_DIR / "vendor", filename, max_age=31536000)
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resp
 
 @app.route("/<path:filename>")
 def static_files(filename):
+    path = Path(filename)
+    if any(part.startswith(".") for part in path.parts) or path.suffix.lower() not in STATIC_SUFFIXES:
+        abort(404)
     return send_from_directory(DASHBOARD_DIR, filename)
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8080, debug=False)
+    try:
+        from waitress import serve
+    except ImportError:
+        # waitress not installed; fall back to the Werkzeug development server
+        app.run(host="0.0.0.0", port=8080, debug=False, threaded=True)
+    else:
+        serve(app, host="0.0.0.0", port=8080, threads=8)